@@ -0,0 +1,54 @@
+"""Regression check of kernels.linprog_simplex against HiGHS
+
+Builds RMPs from generated instances, after a few pricing rounds so they hold
+more than the initial columns, and checks that the dense simplex reaches the
+HiGHS objective with optimal duals. Needs highspy; run with
+`python check_kernels.py`, which fails with an AssertionError on a mismatch.
+"""
+import numpy as np
+from column_generation import ColumnGenerationSolver
+from generate_instances import ReplenishmentConfig, generate_instance
+from kernels import linprog_simplex
+from lp_backend import LPBackend
+
+TOL = 1e-6
+
+
+def rmp_arrays(solver):
+    """Covering matrix, demand and column costs of the solver's current RMP"""
+    A, rhs = solver._demand_matrix()
+    return A, rhs, np.array([col['cost'] for col in solver.columns])
+
+
+def check_optimal(A, rhs, costs):
+    status, duals, _, obj = linprog_simplex(rhs, np.ascontiguousarray(A.T.toarray()), costs)
+    assert status == 0, f"simplex status {status}"
+
+    highs = LPBackend("check")
+    highs.load(costs, A, rhs)
+    assert highs.optimize(), "HiGHS did not solve the RMP"
+    ref = highs.objective()
+    assert abs(obj - ref) <= TOL * max(1.0, abs(ref)), f"objective {obj} != HiGHS {ref}"
+
+    # Duals must be an optimal solution of the dual LP, whether or not they are unique
+    assert duals.min() >= -TOL, "negative dual"
+    assert (A.T @ duals - costs).max() <= TOL * max(1.0, costs.max()), "duals infeasible"
+    assert abs(rhs @ duals - ref) <= TOL * max(1.0, abs(ref)), "duals not optimal"
+    return obj, np.abs(duals - highs.dual()).max()
+
+
+if __name__ == "__main__":
+    for S, P, T in [(3, 2, 7), (5, 4, 7), (4, 3, 14)]:
+        cfg = ReplenishmentConfig(num_products=P, num_stores=S, time_horizon=T,
+                                  holding_cost={p: 0.01 for p in range(P)})
+        solver = ColumnGenerationSolver(generate_instance(cfg))
+        for _ in range(3):
+            obj, dual_diff = check_optimal(*rmp_arrays(solver))
+            print(f"S={S} P={P} T={T} columns={len(solver.columns)}: "
+                  f"objective {obj:.4f}, max dual difference to HiGHS {dual_diff:.2e}")
+            new_cols = solver.pricing_problem(solver.solve_rmp()[2])
+            if not new_cols:
+                break
+            solver._add_columns(new_cols)
+
+    print("linprog_simplex matches HiGHS")
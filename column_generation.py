@@ -1,250 +1,440 @@
-from pulp import LpProblem, LpMinimize, lpSum, LpVariable, LpStatus, value
+import numpy as np
 import pandas as pd
+from scipy.sparse import csc_matrix, csr_matrix
+from lp_backend import make_backend
+from kernels import NUMBA_AVAILABLE, build_initial_cols, linprog_simplex
 from generate_instances import generate_instance, ReplenishmentConfig
-from math import ceil
-import math
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+
+# Upper bound on case packs per order in the pricing subproblem
+BIG_M = 100
+# Largest RMP (columns * (columns + rows)) solved with the dense Numba simplex
+DENSE_SIMPLEX_MAX_ENTRIES = 250_000
+# Limits on the final integer RMP: seconds, and relative MIP gap
+FINAL_MIP_TIME_LIMIT = 60.0
+FINAL_MIP_REL_GAP = 1e-3
+# Columns offered per (store, product) by each pricing round; pricing is
+# closed-form and RMP solves are cheap, so extra columns mostly grow the pool
+PRICING_COLUMNS_PER_PAIR = 1
+
+def _price_one(args):
+    """Prices a block of (store, product) rows in closed form
+
+    args is (duals, ordering_cost, unit_holding, moq, k); returns orders (n, k, T),
+    cost and reduced cost (n, k): the optimum, then k - 1 single-day variants.
+    """
+    duals, ordering_cost, unit_holding, moq, k = args
+    n, T = duals.shape
+
+    # Candidate pack quantities per (row, day)
+    candidates = np.zeros((n, T, 3))
+    candidates[..., 1] = moq[:, None]
+    candidates[..., 2] = BIG_M
+
+    # Reduced cost of each candidate: ordering cost + (holding - dual) * packs
+    profit_per_pack = duals - unit_holding[:, None]
+    reduced_costs = (np.where(candidates > 0, ordering_cost[:, None, None], 0.0) -
+                     profit_per_pack[..., None] * candidates)
+    best = reduced_costs.argmin(axis=-1)[..., None]
+    best_orders = np.take_along_axis(candidates, best, axis=-1)[..., 0]
+    best_reduced_costs = np.take_along_axis(reduced_costs, best, axis=-1)
+    best_reduced_cost = best_reduced_costs.sum(axis=(1, 2))
+
+    # Extra reduced cost of moving a single day off its optimal candidate
+    penalty = reduced_costs - best_reduced_costs
+    np.put_along_axis(penalty, best, np.inf, axis=-1)
+    penalty = penalty.reshape(n, T * 3)
+    num_alt = min(k - 1, 2 * T)
+    alt = np.argsort(penalty, axis=1)[:, :num_alt]
+
+    rows = np.arange(n)[:, None]
+    orders = np.repeat(best_orders[:, None, :], num_alt + 1, axis=1)
+    orders[rows, np.arange(1, num_alt + 1), alt // 3] = candidates.reshape(n, T * 3)[rows, alt]
+    reduced_cost = best_reduced_cost[:, None] + np.concatenate(
+        [np.zeros((n, 1)), np.take_along_axis(penalty, alt, axis=1)], axis=1)
+    cost = (ordering_cost[:, None, None] * (orders > 0) +
+            unit_holding[:, None, None] * orders).sum(axis=2)
+    return orders, cost, reduced_cost
+
 
 class ColumnGenerationSolver:
-    def __init__(self, instance):
+    def __init__(self, instance, workers=1):
+        """`workers` processes price columns in parallel; None uses os.cpu_count()"""
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be None or at least 1, got {workers}")
         self.instance = instance
         self.cfg = instance["config"]
-        self.columns = self._initialize_columns()
+        self.workers = workers
+        self._executor = None
+        self._pricing_data = None
+        # Column indices per (store, product), so each demand row only visits its own columns
+        self._cols_by_sp = defaultdict(list)
+        # (store, product, orders, cost) of every pooled column, to reject duplicates
+        self._col_hashes = set()
+        self.columns = []
+        # orders of every column stacked row-wise, shape (len(self.columns), T)
+        self._orders_mat = np.zeros((0, self.cfg.time_horizon), dtype=np.int32)
+        self._add_columns(self._initialize_columns())
+        # Persistent RMP: later iterations only append the new columns
+        self._rmp = None
+        self._basis = None
+        self._num_rmp_cols = 0
+        # Dense copy of the RMP (one row per column) for the small-instance simplex
+        self._dense_At = np.zeros((0, self.cfg.num_stores * self.cfg.num_products *
+                                   self.cfg.time_horizon))
+        self._dense_costs = np.zeros(0)
+        self._num_dense_cols = 0
 
     def _initialize_columns(self):
         """Generate columns that attempt to fulfill demand for all days"""
+        S, P, T = self.cfg.num_stores, self.cfg.num_products, self.cfg.time_horizon
+        demand = self.instance["demand"]
+
+        # Column 1: Aggressive ordering to meet all demand, for every (store, product) at once
+        orders, shortage, aggressive_cost = build_initial_cols(
+            np.ascontiguousarray(demand, dtype=np.int64),
+            np.ascontiguousarray(self.instance["initial_inventory"], dtype=np.int64),
+            self.cfg.product_array("case_pack_size", np.int64),
+            self.cfg.product_array("min_order_qty", np.int64),
+            self.cfg.product_array("ordering_cost"),
+            self.cfg.product_array("holding_cost"),
+            self.cfg.product_array("shortage_cost"))
+        orders = orders.astype(np.int32)
+        # Column 2: No orders (worst case scenario)
+        no_order_cost = self.cfg.product_array("shortage_cost") * demand.sum(axis=2)
+        # Column 3: Order on every day with demand, ignoring stock, so every demand
+        # row is covered and the RMP is feasible from the first iteration
+        case_pack = self.cfg.product_array("case_pack_size", np.int64)[:, None]
+        moq = self.cfg.product_array("min_order_qty", np.int64)[:, None]
+        cover_orders = np.where(demand > 0, np.maximum(-(-demand // case_pack), moq),
+                                0).astype(np.int32)
+        cover_cost = (self.cfg.product_array("ordering_cost") * (cover_orders > 0).sum(axis=2) +
+                      self.cfg.product_array("holding_cost") * case_pack[:, 0] *
+                      cover_orders.sum(axis=2))
+
         columns = []
-        for s in range(self.cfg.num_stores):
-            for p in range(self.cfg.num_products):
-                # Column 1: Aggressive ordering to meet all demand
-                orders = [0] * self.cfg.time_horizon
-                shortage = [0] * self.cfg.time_horizon
-                inv = self.instance["initial_inventory"][(s, p)]
-                
-                for t in range(self.cfg.time_horizon):
-                    current_demand = self.instance["demand"][(s, p, t)]
-                    
-                    # Calculate needed units considering current inventory
-                    needed = max(0, current_demand - inv)
-                    if needed > 0:
-                        # Calculate minimum packs needed (respecting MOQ)
-                        packs = max(
-                            math.ceil(needed / self.cfg.case_pack_size[p]),
-                            self.cfg.min_order_qty[p]
-                        )
-                        orders[t] = packs
-                        inv += packs * self.cfg.case_pack_size[p]
-                    
-                    # Fulfill demand and calculate carryover/shortage
-                    inv -= current_demand
-                    if inv < 0:
-                        shortage[t] = abs(inv)
-                        inv = 0
-                
-                # Calculate total cost for this strategy
-                total_cost = sum(
-                    self.cfg.ordering_cost[p] * (1 if orders[t] > 0 else 0) +
-                    self.cfg.holding_cost[p] * inv +
-                    self.cfg.shortage_cost[p] * shortage[t]
-                    for t in range(self.cfg.time_horizon)
-                )
-                
+        for s in range(S):
+            for p in range(P):
                 columns.append({
                     'store': s,
                     'product': p,
-                    'orders': orders,
-                    'shortage': shortage,
-                    'cost': total_cost
+                    'orders': orders[s, p],
+                    'shortage': shortage[s, p].tolist(),
+                    'cost': float(aggressive_cost[s, p])
                 })
-                
-                # Column 2: No orders (worst case scenario)
                 columns.append({
                     'store': s,
                     'product': p,
-                    'orders': [0] * self.cfg.time_horizon,
-                    'shortage': [self.instance["demand"][(s, p, t)] 
-                                for t in range(self.cfg.time_horizon)],
-                    'cost': sum(
-                        self.cfg.shortage_cost[p] * self.instance["demand"][(s, p, t)]
-                        for t in range(self.cfg.time_horizon)
-                    )
+                    'orders': np.zeros(T, dtype=np.int32),
+                    'shortage': demand[s, p].tolist(),
+                    'cost': float(no_order_cost[s, p])
+                })
+                columns.append({
+                    'store': s,
+                    'product': p,
+                    'orders': cover_orders[s, p],
+                    'shortage': [0] * T,
+                    'cost': float(cover_cost[s, p])
                 })
         
         return columns
                 
+    def _add_columns(self, new_cols):
+        """Appends columns to the pool and indexes them by (store, product)
+
+        Columns already in the pool (same store, product, orders and cost) are
+        skipped. Cost is part of the key because initial and priced columns are
+        costed differently, so a cheaper copy of a pooled pattern must still enter.
+        """
+        columns, cols_by_sp, col_hashes = self.columns, self._cols_by_sp, self._col_hashes
+        added = []
+        for col in new_cols:
+            key = (col['store'], col['product'], tuple(np.asarray(col['orders']).tolist()),
+                   col['cost'])
+            if key in col_hashes:
+                continue
+            col_hashes.add(key)
+            cols_by_sp[(col['store'], col['product'])].append(len(columns))
+            columns.append(col)
+            added.append(col['orders'])
+        if added:
+            self._orders_mat = np.vstack([self._orders_mat] + added)
+
+    def _demand_matrix(self):
+        """Builds the demand covering rows A @ lambda >= rhs as a CSR matrix"""
+        S, P, T = self.cfg.num_stores, self.cfg.num_products, self.cfg.time_horizon
+        orders_mat, cols_by_sp = self._orders_mat, self._cols_by_sp
+        data, indices, row_lengths = [], [], []
+        for s in range(S):
+            for p in range(P):
+                # T rows for this (store, product), each over the same column ids
+                col_ids = np.asarray(cols_by_sp[(s, p)], dtype=np.int64)
+                indices.append(np.tile(col_ids, T))
+                data.append(orders_mat[col_ids].T.ravel())
+                row_lengths.append(np.full(T, len(col_ids)))
+        indptr = np.concatenate(([0], np.cumsum(np.concatenate(row_lengths))))
+        A = csr_matrix((np.concatenate(data), np.concatenate(indices), indptr),
+                       shape=(S * P * T, len(self.columns)))
+        A.eliminate_zeros()  # days a column does not order on
+        # Rows are ordered (store, product, day), matching the C-order of the demand array
+        return A, self.instance["demand"].reshape(-1).astype(np.float64)
+
+    def _column_matrix(self, columns):
+        """Builds the demand covering coefficients of `columns` as a CSC matrix"""
+        P, T = self.cfg.num_products, self.cfg.time_horizon
+        data, indices, indptr = [], [], [0]
+        for col in columns:
+            days = np.flatnonzero(col['orders'])
+            indices.append((col['store'] * P + col['product']) * T + days)
+            data.append(col['orders'][days])
+            indptr.append(indptr[-1] + len(days))
+        return csc_matrix((np.concatenate(data) if data else [],
+                           np.concatenate(indices) if indices else [], indptr),
+                          shape=(self.cfg.num_stores * P * T, len(columns)))
+
+    def _solve_rmp_dense(self):
+        """Solves the RMP with the Numba dense simplex; returns (obj, duals) or None
+
+        The simplex runs on the dual LP, max demand @ y s.t. A.T @ y <= cost,
+        y >= 0, whose all-slack start is feasible since column costs are
+        non-negative. Its solution y is exactly the RMP row duals.
+        """
+        new_cols = self.columns[self._num_dense_cols:]
+        if new_cols:
+            self._dense_At = np.vstack([self._dense_At,
+                                        self._column_matrix(new_cols).T.toarray()])
+            self._dense_costs = np.concatenate([self._dense_costs,
+                                                [col['cost'] for col in new_cols]])
+            self._num_dense_cols = len(self.columns)
+        if self._dense_costs.min() < 0:
+            return None
+
+        demand = self.instance["demand"].reshape(-1).astype(np.float64)
+        status, duals, _, obj = linprog_simplex(demand, self._dense_At, self._dense_costs)
+        # The RMP is always feasible, so this is the iteration limit: fall back to HiGHS
+        return (obj, duals) if status == 0 else None
+
     def solve_rmp(self):
-        """Solves Restricted Master Problem with current columns"""
-        rmp = LpProblem("RMP", LpMinimize)
-        
-        # Lambda variables for column selection
-        lambda_vars = LpVariable.dicts("lambda", range(len(self.columns)), 
-                                      lowBound=0, cat="Binary")
-        
-        # Objective: Minimize total cost of selected columns
-        rmp += lpSum(col['cost'] * lambda_vars[i] 
-                    for i, col in enumerate(self.columns))
-        
-        # Demand covering constraints
-        for s in range(self.cfg.num_stores):
-            for p in range(self.cfg.num_products):
-                for t in range(self.cfg.time_horizon):
-                    rmp += lpSum(col['orders'][t] * lambda_vars[i] 
-                                for i, col in enumerate(self.columns) 
-                                if col['store'] == s and col['product'] == p) \
-                            >= self.instance["demand"][(s,p,t)], \
-                            f"Demand_{s}_{p}_{t}"
-        
-        rmp.solve()
-        
-        # Get dual values for pricing
-        duals = {c: rmp.constraints[c].pi for c in rmp.constraints}
-        
-        return rmp, value(rmp.objective), duals
+        """Solves Restricted Master Problem, adding columns created since the last call
+
+        While the dense simplex tableau stays under DENSE_SIMPLEX_MAX_ENTRIES
+        (and Numba is installed) the RMP is solved by kernels.linprog_simplex
+        and the first element returned is None instead of the HiGHS model.
+        """
+        S, P, T = self.cfg.num_stores, self.cfg.num_products, self.cfg.time_horizon
+        num_cols = len(self.columns)
+        if NUMBA_AVAILABLE and num_cols * (num_cols + S * P * T) <= DENSE_SIMPLEX_MAX_ENTRIES:
+            result = self._solve_rmp_dense()
+            if result is not None:
+                obj, duals = result
+                return None, obj, duals.reshape(S, P, T)
+
+        if self._rmp is None:
+            self._rmp = make_backend("RMP")
+            A, rhs = self._demand_matrix()
+            costs = [col['cost'] for col in self.columns]
+            # Lambda variables for column selection (LP relaxation, so duals are valid)
+            self._rmp.load(costs, A, rhs)
+        else:
+            new_cols = self.columns[self._num_rmp_cols:]
+            self._rmp.add_columns([col['cost'] for col in new_cols],
+                                  self._column_matrix(new_cols))
+        self._num_rmp_cols = len(self.columns)
+
+        rmp = self._rmp
+        rmp.set_basis(self._basis)
+        if not rmp.optimize():
+            # Never expected: the initial columns cover every demand row
+            raise RuntimeError("RMP could not be solved to optimality")
+        self._basis = rmp.basis()
+
+        # Get dual values for pricing, indexed [store, product, day]
+        duals = rmp.dual().reshape(S, P, T)
+
+        return rmp, rmp.objective(), duals
     
+    def _pricing_pool(self):
+        """Process pool for pricing, started on first use; None when pricing in-process"""
+        if self.workers == 1:
+            return None
+        if self._executor is None:
+            # spawn, not fork: the parent already runs Numba/HiGHS worker threads
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def close(self):
+        """Shuts down the pricing process pool, if one was started"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _pricing_blocks(self, pool):
+        """Row blocks and their dual-independent pricing coefficients
+
+        Only the duals change between iterations, so the per-row ordering cost,
+        per-pack holding cost and MOQ are gathered once and reused.
+        """
+        if self._pricing_data is None:
+            S, P = self.cfg.num_stores, self.cfg.num_products
+            product_of_row = np.tile(np.arange(P), S)
+            ordering_cost = self.cfg.product_array("ordering_cost")[product_of_row]
+            unit_holding = (self.cfg.product_array("holding_cost") *
+                            self.cfg.product_array("case_pack_size"))[product_of_row]
+            moq = self.cfg.product_array("min_order_qty")[product_of_row]
+            num_blocks = 1 if pool is None else (self.workers or os.cpu_count())
+            self._pricing_data = [(rows, (ordering_cost[rows], unit_holding[rows], moq[rows]))
+                                  for rows in np.array_split(np.arange(S * P), num_blocks)]
+        return self._pricing_data
+
     def pricing_problem(self, duals):
-        """Finds new columns with negative reduced cost"""
+        """Finds new columns with negative reduced cost
+
+        (store, product) pairs are independent, so they are priced in blocks by
+        _price_one, across `workers` processes when more than one is requested.
+        Each pair can contribute up to PRICING_COLUMNS_PER_PAIR columns per round.
+        """
+        S, P, T = self.cfg.num_stores, self.cfg.num_products, self.cfg.time_horizon
+        duals = np.asarray(duals).reshape(S * P, T)
+
+        pool = self._pricing_pool()
+        tasks = [(duals[rows],) + coefficients + (PRICING_COLUMNS_PER_PAIR,)
+                 for rows, coefficients in self._pricing_blocks(pool)]
+        results = list((map if pool is None else pool.map)(_price_one, tasks))
+        orders = np.concatenate([r[0] for r in results])
+        K = orders.shape[1]
+        orders = orders.reshape(S, P, K, T).astype(np.int32)
+        cost = np.concatenate([r[1] for r in results]).reshape(S, P, K)
+        total_reduced_cost = np.concatenate([r[2] for r in results]).reshape(S, P, K)
+
         new_columns = []
-        
-        for s in range(self.cfg.num_stores):
-            for p in range(self.cfg.num_products):
-                # Create subproblem for each (store, product)
-                sp = LpProblem("Pricing", LpMinimize)
-                
-                # Subproblem variables
-                x = LpVariable.dicts("x", range(self.cfg.time_horizon), 
-                                    lowBound=0, cat="Integer")
-                y = LpVariable.dicts("y", range(self.cfg.time_horizon), 
-                                    cat="Binary")
-                
-                # Reduced cost calculation (FIXED TIME INDEXING)
-                sp += lpSum(
-                    self.cfg.ordering_cost[p] * y[t] +
-                    self.cfg.holding_cost[p] * x[t] * self.cfg.case_pack_size[p]
-                    for t in range(self.cfg.time_horizon)
-                ) - lpSum(
-                    duals.get(f"Demand_{s}_{p}_{t}", 0) * x[t] 
-                    for t in range(self.cfg.time_horizon)
-                )
-                
-                # Subproblem constraints (ADDED TIME LOOP)
-                for t in range(self.cfg.time_horizon):
-                    sp += x[t] <= 100 * y[t], f"BigM_{t}"
-                    sp += x[t] >= self.cfg.min_order_qty[p] * y[t], f"MOQ_{t}"
-                    
-                sp.solve()
-                
-                if value(sp.objective) < -1e-5:
-                    new_col = {
-                        'store': s,
-                        'product': p,
-                        'orders': [x[t].varValue for t in range(self.cfg.time_horizon)],
-                        'cost': sum(
-                            self.cfg.ordering_cost[p] * y[t].varValue +
-                            self.cfg.holding_cost[p] * x[t].varValue * self.cfg.case_pack_size[p]
-                            for t in range(self.cfg.time_horizon)
-                        )
-                    }
-                    new_columns.append(new_col)
+        for s, p, k in np.argwhere(total_reduced_cost < -1e-5):
+            s, p, k = int(s), int(p), int(k)
+            col_cost = float(cost[s, p, k])
+            if (s, p, tuple(orders[s, p, k].tolist()), col_cost) in self._col_hashes:
+                continue
+            new_columns.append({
+                'store': s,
+                'product': p,
+                # A copy, so the column does not keep this round's whole pricing array alive
+                'orders': orders[s, p, k].copy(),
+                'cost': col_cost,
+                'reduced_cost': float(total_reduced_cost[s, p, k])
+            })
         
         return new_columns
 
     
     def solve(self, optimality_gap_threshold=1e-5, max_iter=1000):
-        """Column Generation loop"""
-        best_lower_bound = float('inf')
+        """Column Generation loop, stopped early once the Lagrangian gap is below the threshold
+
+        The bound is valid but loose, so the default threshold runs to convergence;
+        even 0.5 only saves the last iteration or two.
+        """
+        # Upper bound on each (store, product)'s sum of lambdas in some optimal solution
+        kappa = (self.instance["demand"].sum(axis=2) /
+                 np.minimum(self.cfg.product_array("min_order_qty"), BIG_M))
+        best_lower_bound = -float('inf')
         i = 0
 
-        while i < max_iter:
-            rmp, obj, duals = self.solve_rmp()
-            new_cols = self.pricing_problem(duals)
+        try:
+            while i < max_iter:
+                rmp, obj, duals = self.solve_rmp()
+                new_cols = self.pricing_problem(duals)
             
-            if not new_cols:
-                print(f"Optimal after {i+1} iterations")
-                break
+                if not new_cols:
+                    best_lower_bound = obj
+                    print(f"Optimal after {i+1} iterations")
+                    break
                 
-            self.columns.extend(new_cols)
-            current_obj_value = obj
-            best_lower_bound = min(best_lower_bound, current_obj_value)
-            optimality_gap = (current_obj_value - best_lower_bound) / current_obj_value
-            print(f"Iteration {i+1}: Optimality gap: {100 * optimality_gap:.2f}%")
+                self._add_columns(new_cols)
+                best_reduced_cost = {}
+                for col in new_cols:
+                    key = (col['store'], col['product'])
+                    best_reduced_cost[key] = min(best_reduced_cost.get(key, 0.0), col['reduced_cost'])
+                best_lower_bound = max(best_lower_bound, obj + sum(
+                    kappa[key] * reduced_cost for key, reduced_cost in best_reduced_cost.items()))
+                optimality_gap = (obj - best_lower_bound) / abs(obj) if obj else 0.0
+                print(f"Iteration {i+1}: Optimality gap: {100 * optimality_gap:.2f}%")
             
-            if optimality_gap < optimality_gap_threshold:
-                print(f"Optimality gap threshold reached after {i+1} iterations")
-                break
+                if optimality_gap < optimality_gap_threshold:
+                    print(f"Optimality gap threshold reached after {i+1} iterations")
+                    break
 
-            i += 1
+                i += 1
+        finally:
+            self.close()
 
         # Final solution
         final_schedule = self.generate_schedule()
-        final_obj_value = value(rmp.objective)
-        final_optimality_gap = (final_obj_value - best_lower_bound) / final_obj_value
+        final_obj_value = obj
+        final_optimality_gap = ((final_obj_value - best_lower_bound) / abs(final_obj_value)
+                                if final_obj_value else 0.0)
         print(f"Final Optimality Gap: {100 * final_optimality_gap:.2f}%")
         return final_schedule
 
-    def generate_schedule(self):
+    def generate_schedule(self, time_limit=FINAL_MIP_TIME_LIMIT, mip_rel_gap=FINAL_MIP_REL_GAP):
         """Convert lambda variables to time-series schedule"""
         # Solve final RMP with integer constraints
-        final_rmp = LpProblem("FinalRMP", LpMinimize)
-        lambda_vars = LpVariable.dicts("lambda", range(len(self.columns)), 
-                                    lowBound=0, cat="Integer")
+        final_rmp = make_backend("FinalRMP")
+        A, rhs = self._demand_matrix()
+        final_rmp.load([col['cost'] for col in self.columns], A, rhs, integer=True)
         
-        final_rmp += lpSum(col['cost'] * lambda_vars[i] 
-                        for i, col in enumerate(self.columns))
+        # Check solution status first; past the limits, the incumbent is used
+        if not final_rmp.optimize(time_limit=time_limit, mip_rel_gap=mip_rel_gap):
+            if not final_rmp.has_solution():
+                raise RuntimeError("No integer solution found for the final RMP")
+            print("Final RMP stopped at its limits; using the best integer solution found")
+        lambda_values = np.rint(final_rmp.values())
         
-        # Add demand constraints
-        for s in range(self.cfg.num_stores):
-            for p in range(self.cfg.num_products):
-                for t in range(self.cfg.time_horizon):
-                    final_rmp += lpSum(col['orders'][t] * lambda_vars[i] 
-                                    for i, col in enumerate(self.columns) 
-                                    if col['store'] == s and col['product'] == p) \
-                                >= self.instance["demand"][(s,p,t)]
-        
-        final_rmp.solve()
-        
-        # Check solution status first
-        if final_rmp.status != 1:
-            print("No feasible solution found")
-        
-        # Build schedule with safe value checking and days inventory left
-        schedule = []
-        inventory = {(s, p): self.instance["initial_inventory"][(s, p)] 
-                    for s in range(self.cfg.num_stores) 
-                    for p in range(self.cfg.num_products)}
-
-        for i in range(len(self.columns)):
-            var_value = value(lambda_vars[i])  # Safe value extraction
-            if var_value and var_value > 0:
-                col = self.columns[i]
-                for t in range(self.cfg.time_horizon):
-                    if col['orders'][t] > 0:
-                        s, p = col['store'], col['product']
-                        units_ordered = col['orders'][t] * self.cfg.case_pack_size[p]
-                        inventory[(s, p)] += units_ordered
-                        demand = self.instance["demand"][(s, p, t)]
-                        inventory[(s, p)] = max(0, inventory[(s, p)] - demand)
-                        
-                        # Calculate days inventory left
-                        future_demand = sum(self.instance["demand"][(s, p, t2)] 
-                                            for t2 in range(t+1, self.cfg.time_horizon))
-                        if future_demand > 0:
-                            days_inventory_left = min(
-                                self.cfg.time_horizon - t - 1,
-                                inventory[(s, p)] / (future_demand / (self.cfg.time_horizon - t - 1))
-                            )
-                        else:
-                            days_inventory_left = self.cfg.time_horizon - t - 1
-
-                        schedule.append({
-                            'Store': f"Location_{s}",
-                            'Product': f"SKU_{p}",
-                            'Day': t,
-                            'Case_Packs': col['orders'][t],
-                            'Units': units_ordered,
-                            'Days_Inventory_Left': round(days_inventory_left, 1)
-                        })
+        # Selected columns and every (column, day) they order on, in column order
+        orders = self._orders_mat.astype(np.int64)
+        col_store = np.array([col['store'] for col in self.columns])
+        col_product = np.array([col['product'] for col in self.columns])
+        selected = np.nonzero(lambda_values > 0)[0]
+        rows, days = np.nonzero(orders[selected] > 0)
+        cols = selected[rows]
+        stores, products = col_store[cols], col_product[cols]
+        packs = orders[cols, days]
+        units = packs * self.cfg.product_array("case_pack_size", np.int64)[products]
+        demand_arr = self.instance["demand"]
+        demands = demand_arr[stores, products, days]
+        # Demand strictly after each day: reverse cumulative sum minus the day itself
+        future_demand_arr = np.flip(np.flip(demand_arr, axis=2).cumsum(axis=2), axis=2) - demand_arr
+        future_demands = future_demand_arr[stores, products, days]
 
-        
-        return pd.DataFrame(schedule)
+        # Build schedule with days inventory left; stock carries over between events
+        inventory = self.instance["initial_inventory"].astype(np.int64)
+        T = self.cfg.time_horizon
+        days_left = np.empty(len(days))
+
+        for k, (s, p, t, units_ordered, demand, future_demand) in enumerate(zip(
+                stores.tolist(), products.tolist(), days.tolist(),
+                units.tolist(), demands.tolist(), future_demands.tolist())):
+            inventory[s, p] = max(0, inventory[s, p] + units_ordered - demand)
+
+            # Calculate days inventory left
+            if future_demand > 0:
+                days_inventory_left = min(T - t - 1,
+                                          inventory[s, p] / (future_demand / (T - t - 1)))
+            else:
+                days_inventory_left = T - t - 1
+            days_left[k] = round(days_inventory_left, 1)
+
+        # Build the frame from whole columns; labels are formatted once per store/product
+        store_labels = np.array([f"Location_{s}" for s in range(self.cfg.num_stores)])
+        product_labels = np.array([f"SKU_{p}" for p in range(self.cfg.num_products)])
+        return pd.DataFrame({
+            'Store': store_labels[stores],
+            'Product': product_labels[products],
+            'Day': days,
+            'Case_Packs': packs,
+            'Units': units,
+            'Days_Inventory_Left': days_left
+        })
 
 
 # Usage
@@ -257,4 +447,3 @@ if __name__ == "__main__":
     
     print("\nFinal Replenishment Schedule:")
     print(schedule.to_markdown(index=False))
-    # print("RMP status", LpStatus[solver.solve_rmp()[0]])
\ No newline at end of file
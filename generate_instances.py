@@ -1,4 +1,3 @@
-import random
 from dataclasses import dataclass
 from typing import Dict, List
 import numpy as np
@@ -26,55 +25,58 @@ class ReplenishmentConfig:
     min_order_qty: Dict[int, int] = None       # ProductID -> MOQ
     case_pack_size: Dict[int, int] = None      # ProductID -> Units/case
 
+    def product_array(self, field, dtype=np.float64):
+        """Per-product parameter `field` as a (num_products,) array"""
+        values = getattr(self, field)
+        return np.array([values[p] for p in range(self.num_products)], dtype=dtype)
+
 def generate_instance(cfg: ReplenishmentConfig):
     """Generates a random problem instance with configurable parameters"""
-    random.seed(42)
+    # Local generator: reproducible without touching the global random state
+    rng = np.random.default_rng(42)
     products = list(range(cfg.num_products))
-    stores = list(range(cfg.num_stores))
     
     # Generate default values if not provided
     if cfg.warehouse_capacity is None:
         cfg.warehouse_capacity = {
-            p: max(50, int((cfg.num_stores * cfg.num_products * cfg.time_horizon * random.uniform(50, 150))))
+            p: max(50, int((cfg.num_stores * cfg.num_products * cfg.time_horizon * rng.uniform(50, 150))))
             for p in products
         }
 
         
     if cfg.ordering_cost is None:
-        cfg.ordering_cost = {p: round(random.uniform(5, 20), 2) for p in products}
+        cfg.ordering_cost = {p: round(float(rng.uniform(5, 20)), 2) for p in products}
         
     if cfg.holding_cost is None:
-        cfg.holding_cost = {p: round(random.uniform(0.1, 1.5), 2) for p in products}
+        cfg.holding_cost = {p: round(float(rng.uniform(0.1, 1.5)), 2) for p in products}
         
     if cfg.shortage_cost is None:
-        cfg.shortage_cost = {p: round(random.uniform(3, 10), 2) for p in products}
+        cfg.shortage_cost = {p: round(float(rng.uniform(3, 10)), 2) for p in products}
         
     if cfg.base_demand is None:
-        cfg.base_demand = {p: random.randint(5, 30) for p in products}
+        cfg.base_demand = {p: int(rng.integers(5, 31)) for p in products}
         
     if cfg.min_order_qty is None:
-        cfg.min_order_qty = {p: random.choice([1, 5, 10]) for p in products}
+        cfg.min_order_qty = {p: int(rng.choice([1, 5, 10])) for p in products}
         
     if cfg.case_pack_size is None:
-        cfg.case_pack_size = {p: random.randint(5, 25) for p in products}
+        cfg.case_pack_size = {p: int(rng.integers(5, 26)) for p in products}
 
-    total_capacity = {p: cfg.warehouse_capacity[p] * cfg.time_horizon for p in products}
+    total_capacity = cfg.product_array("warehouse_capacity") * cfg.time_horizon
 
-    # Generate stochastic demand
-    demand = {}
-    for p in products:
-        for t in range(cfg.time_horizon):
-            for s in stores:
-                max_demand = total_capacity[p] / (cfg.num_stores * cfg.time_horizon)
-                demand[(s, p, t)] = max(0, int(
-                    np.random.poisson(max_demand * random.uniform(0.5, 1.5))
-                ))
+    # Generate stochastic demand, all (store, product, day) cells in one draw
+    shape = (cfg.num_stores, cfg.num_products, cfg.time_horizon)
+    max_demand = total_capacity / (cfg.num_stores * cfg.time_horizon)
+    multiplier = rng.uniform(0.5, 1.5, size=shape)
+    demand = rng.poisson(max_demand[None, :, None] * multiplier).clip(min=0).astype(np.int32)
     
+    initial_inventory = rng.integers(0, 21, size=(cfg.num_stores, cfg.num_products),
+                                     dtype=np.int32)
+
     return {
         "config": cfg,
         "demand": demand,
-        "initial_inventory": { (s, p): random.randint(0, 20) 
-                              for s in stores for p in products }
+        "initial_inventory": initial_inventory
     }
 
 # Example usage:
@@ -88,9 +90,9 @@ if __name__ == "__main__":
     instance = generate_instance(cfg)
     print("Generated instance with:")
     print(f"- {cfg.num_products} products across {cfg.num_stores} stores")
-    print(f"- Demand: {list(instance['demand'].items())}")
+    print(f"- Demand: {instance['demand'].tolist()}")
     print(f"- Ordering costs: {cfg.ordering_cost}")
-    print(f"- Initial inventory: {instance['initial_inventory']}")
+    print(f"- Initial inventory: {instance['initial_inventory'].tolist()}")
     print(f"- Warehouse capacity: {cfg.warehouse_capacity}")
     print(f"- Min order qty: {cfg.min_order_qty}")
     print(f"- Case pack size: {cfg.case_pack_size}")
@@ -100,13 +102,13 @@ if __name__ == "__main__":
     data = []
 
     # Populate the data list
-    for (store, product, day), demand in instance['demand'].items():
+    for (store, product, day), demand in np.ndenumerate(instance['demand']):
         data.append({
             'Store': f"Location_{store}",
             'Product': f"SKU_{product}",
             'Day': day,
             'Demand': demand,
-            'Initial Inventory': instance['initial_inventory'][(store, product)],
+            'Initial Inventory': instance['initial_inventory'][store, product],
             'Warehouse Capacity': cfg.warehouse_capacity[product],
             'Ordering Cost': cfg.ordering_cost[product],
             'Min Order Qty': cfg.min_order_qty[product],
@@ -125,8 +127,8 @@ if __name__ == "__main__":
     # Print additional information
     print(f"\nTime horizon: {cfg.time_horizon} days")
     print(f"Demand variance: {cfg.demand_variance:.0%}")
-# demand[(store_idx, product_idx, day)] = units_needed
-# initial_inventory[(store_idx, product_idx)] = stock_on_hand
+# demand[store_idx, product_idx, day] = units_needed
+# initial_inventory[store_idx, product_idx] = stock_on_hand
 # warehouse_capacity[product_idx] = max_units
 # ordering_cost[product_idx] = cost/order
 # holding_cost[product_idx] = cost/unit/day
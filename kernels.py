@@ -0,0 +1,112 @@
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # kernels still run, as plain Python
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+
+@njit(parallel=True, cache=True)
+def build_initial_cols(demand, init_inv, case_pack, moq, ord_c, hold_c, short_c):
+    """Greedy "aggressive ordering" schedule for every (store, product)
+
+    demand is (S, P, T), init_inv is (S, P), the cost/pack arrays are (P,).
+    Returns orders and shortage as (S, P, T) and the column cost as (S, P).
+    """
+    S, P, T = demand.shape
+    orders = np.zeros((S, P, T), dtype=np.int64)
+    shortage = np.zeros((S, P, T), dtype=np.int64)
+    cost = np.zeros((S, P))
+
+    for sp in prange(S * P):
+        s = sp // P
+        p = sp % P
+        inv = init_inv[s, p]
+        num_orders = 0
+        total_shortage = 0
+        for t in range(T):
+            # Calculate needed units considering current inventory
+            needed = demand[s, p, t] - inv
+            if needed > 0:
+                # Calculate minimum packs needed (respecting MOQ)
+                packs = max((needed + case_pack[p] - 1) // case_pack[p], moq[p])
+                orders[s, p, t] = packs
+                inv += packs * case_pack[p]
+                num_orders += 1
+
+            # Fulfill demand and calculate carryover/shortage
+            inv -= demand[s, p, t]
+            if inv < 0:
+                shortage[s, p, t] = -inv
+                total_shortage += -inv
+                inv = 0
+
+        # Holding is charged on the closing stock for every day
+        cost[s, p] = (ord_c[p] * num_orders + hold_c[p] * inv * T +
+                      short_c[p] * total_shortage)
+
+    return orders, shortage, cost
+
+
+@njit(cache=True)
+def linprog_simplex(c, A_ub, b_ub, max_iter=10000, tol=1e-9):
+    """Maximises c @ x subject to A_ub @ x <= b_ub, x >= 0, for b_ub >= 0
+
+    Dense tableau simplex started from the all-slack basis (feasible because
+    b_ub >= 0), pivoting with Bland's rule so degenerate problems terminate.
+    Returns (status, x, duals, obj); status is 0 optimal, 1 iteration limit,
+    2 unbounded.
+    """
+    m, n = A_ub.shape
+    tab = np.zeros((m + 1, n + m + 1))
+    tab[:m, :n] = A_ub
+    for i in range(m):
+        tab[i, n + i] = 1.0
+    tab[:m, -1] = b_ub
+    tab[m, :n] = -c
+    basis = np.arange(n, n + m)
+
+    status = 1
+    for _ in range(max_iter):
+        # Entering column: lowest index with a negative reduced cost
+        pivcol = -1
+        for j in range(n + m):
+            if tab[m, j] < -tol:
+                pivcol = j
+                break
+        if pivcol < 0:
+            status = 0
+            break
+
+        # Leaving row: minimum ratio, ties broken by lowest basic index
+        pivrow = -1
+        best = np.inf
+        for i in range(m):
+            if tab[i, pivcol] > tol:
+                ratio = tab[i, -1] / tab[i, pivcol]
+                if ratio < best - tol or (ratio <= best + tol and basis[i] < basis[pivrow]):
+                    best = ratio
+                    pivrow = i
+        if pivrow < 0:
+            status = 2
+            break
+
+        tab[pivrow] /= tab[pivrow, pivcol]
+        for i in range(m + 1):
+            if i != pivrow and tab[i, pivcol] != 0.0:
+                tab[i] -= tab[i, pivcol] * tab[pivrow]
+        basis[pivrow] = pivcol
+
+    x = np.zeros(n)
+    for i in range(m):
+        if basis[i] < n:
+            x[basis[i]] = tab[i, -1]
+    return status, x, tab[m, n:n + m].copy(), tab[m, -1]
@@ -0,0 +1,186 @@
+import math
+import numpy as np
+from pulp import (LpProblem, LpMinimize, LpVariable, LpConstraint, LpStatus,
+                  LpAffineExpression, LpConstraintGE, LpConstraintLE, LpConstraintEQ,
+                  LpSolutionOptimal, LpSolutionIntegerFeasible, PULP_CBC_CMD, value)
+
+try:
+    import highspy
+except ImportError:  # PuLP/CBC is used as a fallback
+    highspy = None
+
+INF = math.inf
+
+
+class LPBackend:
+    """Thin LP/MIP adapter that talks to HiGHS directly (no LP file, no subprocess)"""
+
+    def __init__(self, name="model"):
+        self.name = name
+        self.h = highspy.Highs()
+        self.h.setOptionValue("output_flag", False)
+
+    def add_var(self, cost, lb=0.0, ub=INF, integer=False):
+        """Adds a column with no constraint coefficients and returns its index"""
+        j = self.h.getNumCol()
+        self.h.addCol(float(cost), float(lb), float(ub), 0,
+                      np.empty(0, dtype=np.int32), np.empty(0))
+        if integer:
+            self.h.changeColIntegrality(j, highspy.HighsVarType.kInteger)
+        return j
+
+    def add_constraint(self, indices, values, lb=-INF, ub=INF):
+        """Adds lb <= sum(values * x[indices]) <= ub and returns its row index"""
+        i = self.h.getNumRow()
+        indices = np.asarray(indices, dtype=np.int32)
+        self.h.addRow(float(lb), float(ub), len(indices), indices,
+                      np.asarray(values, dtype=np.float64))
+        return i
+
+    def load(self, c, A, row_lb, row_ub=None, col_ub=INF, integer=False):
+        """Replaces the model with min c@x s.t. row_lb <= A@x <= row_ub, 0 <= x <= col_ub
+
+        `A` is a scipy.sparse CSR matrix.
+        """
+        num_row, num_col = A.shape
+        lp = highspy.HighsLp()
+        lp.num_col_ = num_col
+        lp.num_row_ = num_row
+        lp.col_cost_ = np.asarray(c, dtype=np.float64)
+        lp.col_lower_ = np.zeros(num_col)
+        lp.col_upper_ = np.full(num_col, float(col_ub))
+        lp.row_lower_ = np.asarray(row_lb, dtype=np.float64)
+        lp.row_upper_ = (np.full(num_row, INF) if row_ub is None
+                         else np.asarray(row_ub, dtype=np.float64))
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+        lp.a_matrix_.num_col_ = num_col
+        lp.a_matrix_.num_row_ = num_row
+        lp.a_matrix_.start_ = A.indptr.astype(np.int32)
+        lp.a_matrix_.index_ = A.indices.astype(np.int32)
+        lp.a_matrix_.value_ = A.data.astype(np.float64)
+        if integer:
+            lp.integrality_ = [highspy.HighsVarType.kInteger] * num_col
+        self.h.passModel(lp)
+
+    def add_columns(self, costs, A, ub=INF, integer=False):
+        """Appends columns to the existing rows; `A` is a CSC matrix (num_row x k)"""
+        first = self.h.getNumCol()
+        num_new = A.shape[1]
+        self.h.addCols(num_new, np.asarray(costs, dtype=np.float64), np.zeros(num_new),
+                       np.full(num_new, float(ub)), A.nnz, A.indptr[:-1].astype(np.int32),
+                       A.indices.astype(np.int32), A.data.astype(np.float64))
+        if integer:
+            for j in range(first, first + num_new):
+                self.h.changeColIntegrality(j, highspy.HighsVarType.kInteger)
+
+    def basis(self):
+        return self.h.getBasis()
+
+    def set_basis(self, basis):
+        """Warm-starts from a previous basis; columns added since are nonbasic at zero"""
+        if basis is None or not basis.valid:
+            return
+        missing = self.h.getNumCol() - len(basis.col_status)
+        basis.col_status = list(basis.col_status) + [highspy.HighsBasisStatus.kLower] * missing
+        self.h.setBasis(basis)
+
+    def optimize(self, time_limit=None, mip_rel_gap=None):
+        """Solves the model; returns True if an optimal solution was found"""
+        if time_limit is not None:
+            self.h.setOptionValue("time_limit", float(time_limit))
+        if mip_rel_gap is not None:
+            self.h.setOptionValue("mip_rel_gap", float(mip_rel_gap))
+        self.h.run()
+        return self.h.getModelStatus() == highspy.HighsModelStatus.kOptimal
+
+    def has_solution(self):
+        """True if a feasible solution is available, e.g. the incumbent after a time limit"""
+        return self.h.getInfo().primal_solution_status == highspy.kSolutionStatusFeasible
+
+    def objective(self):
+        return self.h.getInfo().objective_function_value
+
+    def values(self):
+        return np.asarray(self.h.getSolution().col_value)
+
+    def dual(self):
+        return np.asarray(self.h.getSolution().row_dual)
+
+
+class PulpBackend:
+    """Same interface as LPBackend, built on PuLP/CBC for when highspy is missing"""
+
+    def __init__(self, name="model"):
+        self.prob = LpProblem(name, LpMinimize)
+        self.vars = []
+        self.costs = []
+        self.rows = []
+
+    def add_var(self, cost, lb=0.0, ub=INF, integer=False):
+        j = len(self.vars)
+        self.vars.append(LpVariable(f"x_{j}", lowBound=lb,
+                                    upBound=None if ub == INF else ub,
+                                    cat="Integer" if integer else "Continuous"))
+        self.costs.append(cost)
+        return j
+
+    def add_constraint(self, indices, values, lb=-INF, ub=INF):
+        i = len(self.rows)
+        name = f"r_{i}"
+        # Build the expression from (var, coef) pairs directly, skipping zero coefficients
+        expr = LpAffineExpression([(self.vars[j], v) for j, v in zip(indices, values) if v != 0])
+        if lb == ub:
+            self.prob += LpConstraint(expr, LpConstraintEQ, name, lb)
+        elif ub == INF:
+            self.prob += LpConstraint(expr, LpConstraintGE, name, lb)
+        else:
+            self.prob += LpConstraint(expr, LpConstraintLE, name, ub)
+        self.rows.append(name)
+        return i
+
+    def load(self, c, A, row_lb, row_ub=None, col_ub=INF, integer=False):
+        self.__init__(self.prob.name)
+        for cost in c:
+            self.add_var(cost, ub=col_ub, integer=integer)
+        for i in range(A.shape[0]):
+            start, end = A.indptr[i], A.indptr[i + 1]
+            self.add_constraint(A.indices[start:end], A.data[start:end],
+                                row_lb[i], INF if row_ub is None else row_ub[i])
+
+    def add_columns(self, costs, A, ub=INF, integer=False):
+        for k, cost in enumerate(costs):
+            var = self.vars[self.add_var(cost, ub=ub, integer=integer)]
+            for ptr in range(A.indptr[k], A.indptr[k + 1]):
+                if A.data[ptr] != 0:
+                    self.prob.constraints[self.rows[A.indices[ptr]]].addInPlace(
+                        LpAffineExpression([(var, A.data[ptr])]))
+
+    def basis(self):
+        return None
+
+    def set_basis(self, basis):
+        pass
+
+    def optimize(self, time_limit=None, mip_rel_gap=None):
+        self.prob.setObjective(LpAffineExpression(list(zip(self.vars, self.costs))))
+        self.prob.solve(PULP_CBC_CMD(msg=False, timeLimit=time_limit, gapRel=mip_rel_gap))
+        return LpStatus[self.prob.status] == "Optimal"
+
+    def has_solution(self):
+        return self.prob.sol_status in (LpSolutionOptimal, LpSolutionIntegerFeasible)
+
+    def objective(self):
+        return value(self.prob.objective) or 0.0
+
+    def values(self):
+        return np.array([v.varValue or 0.0 for v in self.vars])
+
+    def dual(self):
+        return np.array([self.prob.constraints[name].pi or 0.0 for name in self.rows])
+
+
+def make_backend(name="model"):
+    """Returns a HiGHS backend when highspy is installed, PuLP otherwise"""
+    if highspy is not None:
+        return LPBackend(name)
+    return PulpBackend(name)
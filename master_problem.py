@@ -11,55 +11,56 @@ def solve_rmp(instance):
     
     model = LpProblem("Retail_Replenishment_RMP", LpMinimize)
     
-    # Decision Variables
-    x = LpVariable.dicts("Order", (stores, products, range(time_horizon)), 
-                        lowBound=0, cat="Integer")
-    y = LpVariable.dicts("OrderFlag", (stores, products, range(time_horizon)), 
-                        cat="Binary")
-    I = LpVariable.dicts("Inventory", (stores, products, range(time_horizon)), 
-                        lowBound=0)
-    u = LpVariable.dicts("Shortage", (stores, products, range(time_horizon)), 
-                        lowBound=0)
+    # Decision Variables, flat lists indexed by idx(s, p, t)
+    def idx(s, p, t):
+        return (s * cfg.num_products + p) * time_horizon + t
+
+    keys = [(s, p, t) for s in stores for p in products for t in range(time_horizon)]
+    x = [LpVariable(f"Order_{s}_{p}_{t}", lowBound=0, cat="Integer") for s, p, t in keys]
+    y = [LpVariable(f"OrderFlag_{s}_{p}_{t}", cat="Binary") for s, p, t in keys]
+    I = [LpVariable(f"Inventory_{s}_{p}_{t}", lowBound=0) for s, p, t in keys]
+    u = [LpVariable(f"Shortage_{s}_{p}_{t}", lowBound=0) for s, p, t in keys]
     
     # Objective Function
     model += lpSum(
-        cfg.ordering_cost[p] * y[s][p][t] +
-        cfg.holding_cost[p] * I[s][p][t] +
-        cfg.shortage_cost[p] * u[s][p][t]
-        for s in stores for p in products for t in range(time_horizon)
+        cfg.ordering_cost[p] * y[i] +
+        cfg.holding_cost[p] * I[i] +
+        cfg.shortage_cost[p] * u[i]
+        for i, (s, p, t) in enumerate(keys)
     )
     
     # Constraints
     for s in stores:
         for p in products:
             for t in range(time_horizon):
+                i = idx(s, p, t)
                 # Inventory balance
                 if t == 0:
-                    prev_inv = instance["initial_inventory"][(s, p)]
+                    prev_inv = int(instance["initial_inventory"][s, p])
                 else:
-                    prev_inv = I[s][p][t-1]
+                    prev_inv = I[i - 1]
                 
                 model += (
-                    I[s][p][t] == prev_inv + 
-                    x[s][p][t] * cfg.case_pack_size[p] - 
-                    (instance["demand"][(s, p, t)] - u[s][p][t]),
+                    I[i] == prev_inv + 
+                    x[i] * cfg.case_pack_size[p] - 
+                    (int(instance["demand"][s, p, t]) - u[i]),
                     f"InvBalance_{s}_{p}_{t}"
                 )
                 
                 # Order activation constraints
                 model += (
-                    x[s][p][t] >= y[s][p][t] * cfg.min_order_qty[p],
+                    x[i] >= y[i] * cfg.min_order_qty[p],
                     f"MOQ_Lower_{s}_{p}_{t}"
                 )
                 model += (
-                    x[s][p][t] <= y[s][p][t] * 1000,  # Big-M value
+                    x[i] <= y[i] * 1000,  # Big-M value
                     f"MOQ_Upper_{s}_{p}_{t}"
                 )
     
     # Warehouse capacity constraints
     for p in products:
         model += (
-            lpSum(x[s][p][t] * cfg.case_pack_size[p] 
+            lpSum(x[idx(s, p, t)] * cfg.case_pack_size[p] 
                  for s in stores for t in range(time_horizon)) <= cfg.warehouse_capacity[p],
             f"WarehouseCap_{p}"
         )
@@ -72,18 +73,19 @@ def solve_rmp(instance):
     for s in range(cfg.num_stores):
         for p in range(cfg.num_products):
             for t in range(cfg.time_horizon):
+                i = idx(s, p, t)
                 results.append({
                     "Store": f"Location_{s}",
                     "Product": f"SKU_{p}",
                     "Day": t,
-                    "Start_Inventory": instance["initial_inventory"][(s, p)] if t == 0 
-                                      else I[s][p][t-1].varValue,
-                    "Order_Placed": y[s][p][t].varValue,
-                    "Case_Packs_Ordered": x[s][p][t].varValue,
-                    "Units_Ordered": x[s][p][t].varValue * cfg.case_pack_size[p],
-                    "Demand": instance["demand"][(s, p, t)],
-                    "Shortage": u[s][p][t].varValue,
-                    "End_Inventory": I[s][p][t].varValue
+                    "Start_Inventory": instance["initial_inventory"][s, p] if t == 0 
+                                      else I[i - 1].varValue,
+                    "Order_Placed": y[i].varValue,
+                    "Case_Packs_Ordered": x[i].varValue,
+                    "Units_Ordered": x[i].varValue * cfg.case_pack_size[p],
+                    "Demand": instance["demand"][s, p, t],
+                    "Shortage": u[i].varValue,
+                    "End_Inventory": I[i].varValue
                 })
     
     df = pd.DataFrame(results)